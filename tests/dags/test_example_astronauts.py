@@ -0,0 +1,273 @@
+"""Unit tests for the helpers and tasks of the example_astronauts DAG."""
+
+import itertools
+import warnings
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+from scipy import stats
+
+# Importing Airflow puts the dags folder on sys.path
+import airflow  # noqa: F401
+import example_astronauts
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_correlate_with_astronauts_matches_pearsonr(seed):
+    """
+    test if the correlations and p-values match scipy.stats.pearsonr
+    """
+    rng = np.random.default_rng(seed)
+    samples = rng.normal(size=(12, len(example_astronauts._CORRELATION_COLUMNS)))
+    samples[:, 0] = rng.integers(5, 15, size=12)
+
+    correlations = example_astronauts._correlate_with_astronauts(samples)
+
+    for index, column in enumerate(example_astronauts._CORRELATION_COLUMNS[1:], 1):
+        expected = stats.pearsonr(samples[:, 0], samples[:, index])
+        assert correlations[column]["correlation"] == pytest.approx(expected[0])
+        assert correlations[column]["p_value"] == pytest.approx(expected[1])
+
+
+def test_correlate_with_astronauts_constant_and_perfect_columns():
+    """
+    test if constant columns have no correlation and perfect correlations
+    have a p-value of 0, without numpy warnings
+    """
+    num_astronauts = np.array([7.0, 9.0, 10.0, 12.0])
+    samples = np.column_stack(
+        [num_astronauts, 2 * num_astronauts + 1, np.full(4, 25.0), -num_astronauts]
+    )
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        correlations = example_astronauts._correlate_with_astronauts(samples)
+
+    assert correlations == {
+        "temperature": {"correlation": pytest.approx(1.0), "p_value": 0.0},
+        "wind_speed": {"correlation": None, "p_value": None},
+        "cloud_cover": {"correlation": pytest.approx(-1.0), "p_value": 0.0},
+    }
+
+    samples[:, 0] = 7.0
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        correlations = example_astronauts._correlate_with_astronauts(samples)
+
+    assert all(
+        correlation == {"correlation": None, "p_value": None}
+        for correlation in correlations.values()
+    )
+
+
+def test_correlate_with_astronauts_inexact_constant_column():
+    """
+    test if a constant column whose mean is not exact in floating point (12.3
+    over 3 rows) is still reported as having no correlation
+    """
+    samples = np.array(
+        [
+            [7.0, 18.0, 12.3, 40.0],
+            [9.0, 21.5, 12.3, 35.0],
+            [12.0, 25.0, 12.3, 20.0],
+        ]
+    )
+    assert np.linalg.norm(samples[:, 2] - samples[:, 2].mean()) > 0
+
+    correlations = example_astronauts._correlate_with_astronauts(samples)
+
+    assert correlations["wind_speed"] == {"correlation": None, "p_value": None}
+    assert correlations["temperature"]["correlation"] is not None
+
+
+@pytest.fixture
+def dag_tasks(tmp_path, monkeypatch):
+    """
+    Returns the task callables of the DAG, writing the history to a temporary
+    directory
+    """
+    monkeypatch.setattr(example_astronauts, "_HISTORY_PATH", str(tmp_path))
+    dag = example_astronauts.example_astronauts()
+    return {task.task_id: task.python_callable for task in dag.tasks}
+
+
+def _spacecraft_summary(num_astronauts):
+    return {
+        "ISS": {
+            "model": "International Space Station",
+            "count": num_astronauts,
+            "agencies": ["NASA"],
+            "countries": ["USA"],
+            "orbital_speed_kmh": None,
+            "orbital_velocity_ms": None,
+            "altitude_km": None,
+            "orbital_period_min": None,
+        }
+    }
+
+
+def _weather(temperature):
+    return {
+        "timestamp": "2026-10-15T12:00",
+        "latitude": 12.5,
+        "longitude": -45.25,
+        "temperature": temperature,
+        "wind_speed": 12.3,
+        "cloud_cover": 40,
+    }
+
+
+def _history_rows(history_path):
+    return pq.read_table(history_path).num_rows
+
+
+def test_combine_record_retry_overwrites_its_row(dag_tasks, tmp_path):
+    """
+    test if a retry of the same DAG run replaces its history row instead of
+    adding a duplicate
+    """
+    combine_record = dag_tasks["combine_record"]
+    combine_record(_spacecraft_summary(7), _weather(20.0), run_id="manual__1")
+    combine_record(_spacecraft_summary(7), _weather(20.0), run_id="manual__1")
+    assert _history_rows(tmp_path) == 1
+
+    combine_record(_spacecraft_summary(7), _weather(21.0), run_id="manual__2")
+    assert _history_rows(tmp_path) == 2
+
+
+def test_analyze_correlation_constant_crew_size(dag_tasks):
+    """
+    test if no correlations are computed when the number of astronauts never
+    changed
+    """
+    for run, temperature in enumerate([18.0, 21.5, 25.0]):
+        record = dag_tasks["combine_record"](
+            _spacecraft_summary(7), _weather(temperature), run_id=f"manual__{run}"
+        )
+
+    results = dag_tasks["analyze_correlation"](record)
+
+    assert "correlations" not in results
+    assert "did not vary" in results["message"]
+
+
+def test_analyze_correlation_varying_crew_size(dag_tasks):
+    """
+    test if correlations are computed once the number of astronauts changed
+    """
+    for run, (num_astronauts, temperature) in enumerate(
+        [(7, 18.0), (9, 21.5), (10, 22.0), (12, 25.0)]
+    ):
+        record = dag_tasks["combine_record"](
+            _spacecraft_summary(num_astronauts),
+            _weather(temperature),
+            run_id=f"manual__{run}",
+        )
+
+    results = dag_tasks["analyze_correlation"](record)
+
+    assert results["message"] == "Correlation computed over 4 data points."
+    assert results["correlations"]["temperature"]["correlation"] > 0.9
+    assert results["correlations"]["wind_speed"] == {
+        "correlation": None,
+        "p_value": None,
+    }
+
+
+def _scalar_risk_score(
+    oxygen_saturation, heart_rate, systolic_bp, diastolic_bp, body_temp
+):
+    """The risk scoring rules of the health evaluation, one astronaut at a time"""
+    risk_score = 0
+    if oxygen_saturation < 90:
+        risk_score += 3
+    elif oxygen_saturation < 95:
+        risk_score += 2
+    if heart_rate > 120 or heart_rate < 50:
+        risk_score += 3
+    elif heart_rate > 100 or heart_rate < 60:
+        risk_score += 1
+    if systolic_bp > 140 or systolic_bp < 90:
+        risk_score += 2
+    elif systolic_bp > 130 or diastolic_bp > 85:
+        risk_score += 1
+    if body_temp > 38.0 or body_temp < 36.0:
+        risk_score += 2
+    elif body_temp > 37.5 or body_temp < 36.5:
+        risk_score += 1
+    return risk_score
+
+
+def test_score_vitals_at_the_thresholds():
+    """
+    test if the vectorized risk scores match the scoring rules on both sides
+    of every threshold
+    """
+    vitals = list(
+        itertools.product(
+            [89, 90, 94, 95],
+            [49, 50, 59, 60, 100, 101, 120, 121],
+            [89, 90, 130, 131, 140, 141],
+            [85, 86],
+            [35.9, 36.0, 36.4, 36.5, 37.5, 37.6, 38.0, 38.1],
+        )
+    )
+    columns = [np.array(column) for column in zip(*vitals)]
+
+    risk_scores, risk_flags = example_astronauts._score_vitals(*columns)
+
+    assert risk_scores.tolist() == [_scalar_risk_score(*v) for v in vitals]
+    assert risk_flags.shape == (len(vitals), len(example_astronauts._RISK_FACTORS))
+    # Each vital raises at most one of its two factors
+    assert not (risk_flags[:, 0::2] & risk_flags[:, 1::2]).any()
+
+
+@pytest.mark.parametrize(
+    "risk_score,health_status",
+    [
+        (0, "Normal"),
+        (1, "Monitor"),
+        (2, "Monitor"),
+        (3, "At Risk"),
+        (4, "At Risk"),
+        (5, "Critical"),
+        (10, "Critical"),
+    ],
+)
+def test_health_status_by_score(risk_score, health_status):
+    """
+    test if the status table maps the scores at the boundaries to the right status
+    """
+    assert example_astronauts._HEALTH_STATUS_BY_SCORE[risk_score][0] == health_status
+
+
+def test_health_status_table_covers_the_highest_score():
+    """
+    test if the status table has an entry for the highest possible risk score
+    """
+    highest_score, _ = example_astronauts._score_vitals(
+        np.array([80]),
+        np.array([130]),
+        np.array([150]),
+        np.array([90]),
+        np.array([39.0]),
+    )
+    assert len(example_astronauts._HEALTH_STATUS_BY_SCORE) == highest_score[0] + 1
+
+
+def test_enrich_spacecraft_data_returns_plain_lists(dag_tasks):
+    """
+    test if the operators are returned as lists, which XCom stores as plain
+    JSON arrays, not as the tuples of the spacecraft table
+    """
+    enriched = dag_tasks["enrich_spacecraft_data"](
+        [{"name": "A One", "craft": "ISS"}, {"name": "B Two", "craft": "Unknown"}]
+    )
+
+    for record in enriched["enriched"]:
+        assert type(record["operating_agencies"]) is list
+        assert type(record["operating_countries"]) is list
+    for summary in enriched["spacecraft_summary"].values():
+        assert type(summary["agencies"]) is list
+        assert type(summary["countries"]) is list